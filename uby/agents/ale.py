@@ -7,28 +7,348 @@ Especialista em MAPA, ANVISA, IBAMA
 from agentle.agents.agent import Agent
 from agentle.agents.conversations.local_conversation_store import LocalConversationStore
 from agentle.generations.providers.openrouter.openrouter_generation_provider import OpenRouterGenerationProvider
+from agentle.generations.models.messages.assistant_message import AssistantMessage
+from agentle.generations.models.messages.developer_message import DeveloperMessage
 from agentle.generations.models.messages.user_message import UserMessage
 from agentle.generations.models.message_parts.text import TextPart
+from agentle.generations.models.message_parts.tool_execution_suggestion import ToolExecutionSuggestion
+from agentle.generations.tools.tool import Tool
+from agentle.generations.tools.tool_execution_result import ToolExecutionResult
 from agentle.web.extractor import Extractor
 from agentle.web.extraction_preferences import ExtractionPreferences
-from playwright.async_api import async_playwright
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from aiocache import Cache, cached
+from bs4 import BeautifulSoup
+from html_to_markdown import convert
+from playwright.async_api import Browser, BrowserContext, Playwright, Route, async_playwright
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from typing import Any, AsyncIterator, List, Literal, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import functools
+import hashlib
+import httpx
+import orjson
+import re
+
+from uby.agents.clients import get_http_client, redis_cache_options
+
+
+ALE_MODEL = "anthropic/claude-3.5-sonnet"
+
+# Tentativas quando a saída estruturada não valida (AleResponse, MapaExtraction)
+ALE_MAX_ATTEMPTS = 3
+
+# Rodadas de tools no chat em streaming; a seguinte é forçada a responder em texto (tool_choice="none")
+ALE_CHAT_MAX_TOOL_ROUNDS = 3
+
+# Máximo de contextos Playwright abertos ao mesmo tempo no Chromium compartilhado
+MAX_BROWSER_CONTEXTS = 4
+
+# Páginas de legislação consultadas por buscar_portal_mapa
+MAPA_URLS = (
+    "https://www.gov.br/agricultura/pt-br/assuntos/insumos-agropecuarios/insumos-agricolas/fertilizantes/legislacao",
+    # Adicionar mais URLs relevantes
+)
+
+# Teto de texto por chamada de extração (~100K tokens, metade do contexto do modelo);
+# acima disso as seções de URL são divididas em mais de uma chamada
+MAPA_PROMPT_MAX_CHARS = 400_000
+
+# Normativas do MAPA mudam na escala de semanas; o conteúdo extraído vale 7 dias
+MAPA_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Markdown de cada página baixada vale 1 dia (termos diferentes reaproveitam a página)
+MAPA_PAGE_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Cache das tools no Redis: sobrevive a restarts e deploys.
+# Redis fora do ar só desliga o cache (o aiocache loga e chama a função)
+MAPA_CACHE = {"cache": Cache.REDIS, "namespace": "mapa", **redis_cache_options()}
+
+# Abaixo disso (ou com um container de SPA vazio) a página precisa de JS: vai pro Chromium
+STATIC_MIN_HTML_BYTES = 2048
+SPA_MARKERS = ('<div id="app">', '<div id="root">', '<div id="__next">')
+
+# O LLM só consome o texto da página; o resto é abortado na rede
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "stylesheet", "font", "media"})
 
 
 # Schema de resposta estruturada de Alê
 class AleResponse(BaseModel):
     """Resposta estruturada do agente Alê"""
-    viabilidade_regulatoria: str = Field(description="verde, amarelo ou vermelho")
-    prazo_estimado_meses: str = Field(description="Prazo em meses, ex: '18-24'")
+    viabilidade_regulatoria: Literal["verde", "amarelo", "vermelho"] = Field(description="Semáforo regulatório")
+    prazo_min_meses: int = Field(description="Prazo mínimo estimado em meses, ex: 18")
+    prazo_max_meses: int = Field(description="Prazo máximo estimado em meses, ex: 24")
     custo_estimado: str = Field(description="Custo total, ex: 'R$ 140K-180K'")
     caminho_registro: str = Field(description="Etapas do processo")
     alertas: List[str] = Field(default_factory=list, description="Alertas importantes")
     resumo: str = Field(description="Resumo executivo da análise")
     fonte_normativa: Optional[str] = Field(default=None, description="IN, Portaria, etc")
 
+    @model_validator(mode="before")
+    @classmethod
+    def _parse_prazo(cls, data: Any) -> Any:
+        """Aceita também o prazo em texto ('18-24', '18 a 24 meses') em prazo_estimado_meses"""
+        if isinstance(data, dict) and "prazo_estimado_meses" in data:
+            data = dict(data)
+            numeros = [int(n) for n in re.findall(r"\d+", str(data.pop("prazo_estimado_meses")))]
+            if numeros:
+                data.setdefault("prazo_min_meses", numeros[0])
+                data.setdefault("prazo_max_meses", numeros[-1])
+        return data
+
+    @model_validator(mode="after")
+    def _check_prazo(self) -> "AleResponse":
+        if self.prazo_max_meses < self.prazo_min_meses:
+            raise ValueError("prazo_max_meses menor que prazo_min_meses")
+        return self
+
+
+async def _block_static_resources(route: Route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.fallback()
+
+
+class _BrowserLease:
+    """
+    Fachada de Browser entregue ao Extractor
+
+    O Extractor chama browser.close() ao terminar; aqui isso fecha apenas os
+    contextos criados nesta chamada, mantendo o Chromium compartilhado vivo.
+    Todo contexto novo já nasce bloqueando imagens, CSS, fontes e mídia.
+    """
+
+    def __init__(self, browser: Browser):
+        self._browser = browser
+        self._contexts: List[BrowserContext] = []
+
+    async def new_context(self, **kwargs: Any) -> BrowserContext:
+        context = await self._browser.new_context(**kwargs)
+        self._contexts.append(context)
+        await context.route("**/*", _block_static_resources)
+        return context
+
+    async def close(self) -> None:
+        contexts, self._contexts = self._contexts, []
+        for context in contexts:
+            await context.close()
+
+
+class BrowserManager:
+    """
+    Chromium único por processo, compartilhado entre as chamadas de tools
+
+    Cada chamada recebe contextos isolados (cookies, cache, storage) e o número
+    de chamadas simultâneas é limitado por um semáforo.
+    """
+
+    def __init__(self, max_contexts: int = MAX_BROWSER_CONTEXTS):
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_contexts)
+
+    async def start(self) -> Browser:
+        """Inicia o Chromium (idempotente)"""
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            return self._browser
+
+    async def stop(self) -> None:
+        """Fecha o Chromium e o Playwright"""
+        async with self._lock:
+            if self._browser is not None:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    @asynccontextmanager
+    async def get_context(self) -> AsyncIterator[_BrowserLease]:
+        """
+        Empresta o browser compartilhado para uma chamada
+
+        Fora da API (scripts, testes) o Chromium é iniciado sob demanda.
+        """
+        async with self._semaphore:
+            lease = _BrowserLease(await self.start())
+            try:
+                yield lease
+            finally:
+                await lease.close()
+
+
+browser_manager = BrowserManager()
+
+
+def _ale_provider() -> OpenRouterGenerationProvider:
+    """
+    Provider OpenRouter único do Alê (agente e Extractor)
+
+    Criado sob demanda para não exigir OPENROUTER_API_KEY no import; usa o cliente
+    HTTP compartilhado para reaproveitar conexões entre gerações e agentes.
+    """
+    return _ale_provider_for(get_http_client())
+
+
+@functools.lru_cache(maxsize=1)
+def _ale_provider_for(http_client: httpx.AsyncClient) -> OpenRouterGenerationProvider:
+    # Cache por cliente: se o lifespan fechar e reabrir o cliente, o provider é refeito
+    return OpenRouterGenerationProvider.with_fallback_models(
+        [ALE_MODEL, "anthropic/claude-3-sonnet"],
+        http_client=http_client,
+    )
+
+
+def _mapa_cache_key(func: Any, *args: Any, **kwargs: Any) -> str:
+    """Chave por tool + argumentos normalizados + URLs consultadas"""
+    valores = [str(v).strip().lower() for v in (*args, *kwargs.values())]
+    raw = "|".join([func.__name__, *valores, *MAPA_URLS])
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _page_cache_key(func: Any, url: str) -> str:
+    """Chave por página (a URL crua, sem normalização)"""
+    return f"{func.__name__}:{hashlib.blake2b(url.encode(), digest_size=16).hexdigest()}"
+
+
+# block_ads fica desligado: a rota do Extractor faria continue_() antes da
+# nossa, e o bloqueio do lease já cobre imagens/mídia/fontes de anúncios
+MAPA_BROWSER_PREFERENCES = ExtractionPreferences(
+    only_main_content=True,
+    wait_for_ms=0,
+    block_ads=False,
+    remove_base_64_images=True,
+    timeout_ms=15000,
+)
+
+MAPA_EXTRACTION_INSTRUCTIONS = """
+Você extrai dados de páginas de legislação do MAPA, entregues em Markdown dentro de <markdown>.
+Cada página vem numa seção numerada "====URL i: <url>====".
+Devolva em `paginas` exatamente um item por seção, na mesma ordem das seções.
+Use apenas o que está no texto; o que não for encontrado fica nulo.
+Responda somente com o JSON no schema pedido.
+"""
+
+
+class MapaExtractedContent(BaseModel):
+    informacao_relevante: str
+    numero_normativa: Optional[str] = None
+    data_publicacao: Optional[str] = None
+
+
+class MapaExtraction(BaseModel):
+    """Uma extração por seção de URL, na ordem do prompt"""
+    paginas: List[MapaExtractedContent]
+
+
+# Schemas dos agentes resolvidos no import (e não na 1ª análise)
+AleResponse.model_rebuild()
+MapaExtractedContent.model_rebuild()
+MapaExtraction.model_rebuild()
+
+
+def _html_to_markdown(html: str) -> str:
+    """Mesmo recorte do Extractor (only_main_content), sem scripts, estilos e imagens"""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript", "svg", "img"]):
+        tag.decompose()
+    main_content = (
+        soup.find("main")
+        or soup.find("article")
+        or soup.find("div", {"id": "content"})
+        or soup.find("div", {"class": "content"})
+    )
+    return convert(str(main_content or soup))
+
+
+async def _fetch_static(url: str) -> Optional[str]:
+    """
+    Baixa a página com HTTP puro
+
+    Retorna None quando a requisição falha ou o HTML parece a casca de uma SPA.
+    """
+    try:
+        response = await get_http_client().get(url, timeout=10, follow_redirects=True)
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    html = response.text
+    if len(response.content) < STATIC_MIN_HTML_BYTES or any(marker in html for marker in SPA_MARKERS):
+        return None
+    return html
+
+
+# Página vazia (falha no Chromium) não vai pro cache
+@cached(ttl=MAPA_PAGE_CACHE_TTL_SECONDS, key_builder=_page_cache_key, skip_cache_func=lambda markdown: not markdown, **MAPA_CACHE)
+async def _fetch_markdown(url: str) -> str:
+    """Markdown da página: HTTP puro primeiro, Chromium só para páginas que dependem de JS"""
+    html = await _fetch_static(url)
+    if html is not None:
+        return _html_to_markdown(html)
+    
+    extractor = Extractor(llm=_ale_provider(), model=ALE_MODEL)
+    async with browser_manager.get_context() as browser:
+        _, markdown = await extractor.extract_markdown_async(
+            browser=browser,
+            urls=[url],
+            extraction_preferences=MAPA_BROWSER_PREFERENCES,
+        )
+    return markdown
+
+
+def _batch_sections(sections: List[str]) -> List[List[str]]:
+    """
+    Agrupa as seções em lotes de até MAPA_PROMPT_MAX_CHARS, preservando a ordem
+
+    Uma seção maior que o teto sozinha é cortada nele (e não dividida, para manter
+    uma página extraída por URL).
+    """
+    batches: List[List[str]] = []
+    size = 0
+    for section in sections:
+        section = section[:MAPA_PROMPT_MAX_CHARS]
+        if batches and size + len(section) <= MAPA_PROMPT_MAX_CHARS:
+            batches[-1].append(section)
+            size += len(section)
+        else:
+            batches.append([section])
+            size = len(section)
+    return batches
+
+
+async def _extract_sections(termo: str, sections: List[str]) -> List[MapaExtractedContent]:
+    """
+    Uma única geração para todas as seções do lote
+
+    Repete quando o JSON não bate com o schema (parsed=None) ou quando o número de
+    páginas devolvidas difere do de seções, já que o pareamento com as URLs é por índice.
+    """
+    markdown = "\n\n".join(sections)
+    for _ in range(ALE_MAX_ATTEMPTS):
+        generation = await _ale_provider().generate_by_prompt_async(
+            prompt=(
+                f"Extrair informações sobre: {termo}. Focar em requisitos, prazos e custos.\n\n"
+                f"<markdown>\n{markdown}\n</markdown>"
+            ),
+            model=ALE_MODEL,
+            developer_prompt=MAPA_EXTRACTION_INSTRUCTIONS,
+            response_schema=MapaExtraction,
+        )
+        if generation.parsed is not None and len(generation.parsed.paginas) == len(sections):
+            return generation.parsed.paginas
+    raise ValueError(
+        f"Extração do MAPA sem uma página por seção após {ALE_MAX_ATTEMPTS} tentativas ({len(sections)} seções)"
+    )
+
 
 # Tools que Alê pode usar
+@cached(ttl=MAPA_CACHE_TTL_SECONDS, key_builder=_mapa_cache_key, **MAPA_CACHE)
 async def buscar_portal_mapa(termo: str) -> str:
     """
     Busca informações no Portal do MAPA
@@ -39,43 +359,23 @@ async def buscar_portal_mapa(termo: str) -> str:
     Returns:
         Conteúdo relevante extraído
     """
-    provider = OpenRouterGenerationProvider.with_fallback_models(["anthropic/claude-3.5-sonnet"])
-    extractor = Extractor(llm=provider, model="anthropic/claude-3.5-sonnet")
+    markdowns = await asyncio.gather(*(_fetch_markdown(url) for url in MAPA_URLS))
+    sections = [
+        f"====URL {i}: {url}====\n{markdown}"
+        for i, (url, markdown) in enumerate(zip(MAPA_URLS, markdowns), start=1)
+    ]
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        
-        urls = [
-            "https://www.gov.br/agricultura/pt-br/assuntos/insumos-agropecuarios/insumos-agricolas/fertilizantes/legislacao",
-            # Adicionar mais URLs relevantes
-        ]
-        
-        preferences = ExtractionPreferences(
-            only_main_content=True,
-            wait_for_ms=2000,
-            block_ads=True,
-            remove_base_64_images=True,
-            timeout_ms=15000,
-        )
-        
-        class MapaExtractedContent(BaseModel):
-            informacao_relevante: str
-            numero_normativa: Optional[str] = None
-            data_publicacao: Optional[str] = None
-        
-        result = await extractor.extract_async(
-            browser=browser,
-            urls=urls,
-            extraction_preferences=preferences,
-            prompt=f"Extrair informações sobre: {termo}. Focar em requisitos, prazos e custos.",
-            output=MapaExtractedContent
-        )
-        
-        await browser.close()
-        
-        return result.output_parsed.informacao_relevante
+    # Normalmente um lote só: N páginas, uma chamada ao LLM
+    lotes = await asyncio.gather(*(_extract_sections(termo, lote) for lote in _batch_sections(sections)))
+    paginas = [pagina for lote in lotes for pagina in lote]
+    
+    return "\n\n".join(
+        f"{url}\n{pagina.informacao_relevante}"
+        for url, pagina in zip(MAPA_URLS, paginas, strict=True)
+    )
 
 
+@cached(ttl=MAPA_CACHE_TTL_SECONDS, key_builder=_mapa_cache_key, **MAPA_CACHE)
 async def consultar_dados_abertos_mapa(categoria: str) -> dict:
     """
     Consulta API de Dados Abertos do MAPA
@@ -95,9 +395,36 @@ async def consultar_dados_abertos_mapa(categoria: str) -> dict:
     }
 
 
+async def _run_ale(agent: Agent, messages: list) -> AleResponse:
+    """
+    Roda o agente e repete quando a resposta não valida contra AleResponse
+
+    O provider devolve parsed=None em vez de levantar quando o JSON não bate
+    com o schema; aqui o texto é revalidado para expor o ValidationError.
+    """
+    for attempt in range(1, ALE_MAX_ATTEMPTS + 1):
+        output = await agent.run_async(messages)
+        if output.parsed is not None:
+            return output.parsed
+        try:
+            return AleResponse.model_validate_json(output.text)
+        except ValidationError:
+            if attempt == ALE_MAX_ATTEMPTS:
+                raise
+
+
 # Criar agente Alê
-def create_ale_agent() -> Agent:
-    """Cria e configura o agente Alê"""
+def create_ale_agent(structured: bool = True) -> Agent:
+    """
+    Cria e configura o agente Alê (uma instância por modo, reaproveitada entre requisições)
+    
+    structured=False devolve o agente de chat, que responde em texto livre.
+    """
+    return _build_ale_agent(structured, _ale_provider())
+
+
+@functools.lru_cache(maxsize=2)
+def _build_ale_agent(structured: bool, provider: OpenRouterGenerationProvider) -> Agent:
     
     system_instructions = """
     Você é Alê, agente de inteligência regulatória da UbyAgro.
@@ -124,17 +451,12 @@ def create_ale_agent() -> Agent:
     Foco 95% Brasil. Portfólio: bioestimulantes, nutrição foliar, adjuvantes, biodefensivos.
     """
     
-    provider = OpenRouterGenerationProvider.with_fallback_models([
-        "anthropic/claude-3.5-sonnet",
-        "anthropic/claude-3-sonnet"
-    ])
-    
     agent = Agent(
         instructions=system_instructions,
         generation_provider=provider,
-        model="anthropic/claude-3.5-sonnet",
+        model=ALE_MODEL,
         tools=[buscar_portal_mapa, consultar_dados_abertos_mapa],
-        response_schema=AleResponse,
+        response_schema=AleResponse if structured else None,
         conversation_store=LocalConversationStore(),
     )
     
@@ -170,7 +492,7 @@ async def run_ale_analysis(project_context: dict) -> AleResponse:
     
     Forneça:
     1. Status de viabilidade regulatória (verde/amarelo/vermelho)
-    2. Prazo estimado para registro completo
+    2. Prazo estimado para registro completo (mínimo e máximo em meses)
     3. Custo total estimado (taxas + estudos)
     4. Caminho de registro passo a passo
     5. Alertas ou pontos de atenção
@@ -181,25 +503,11 @@ async def run_ale_analysis(project_context: dict) -> AleResponse:
         UserMessage(parts=[TextPart(text=user_prompt)])
     ]
     
-    output = await agent.run_async(message_history)
-    
-    return output.parsed
+    return await _run_ale(agent, message_history)
 
 
-async def run_ale_chat(user_message: str, project_context: dict, chat_history: list) -> str:
-    """
-    Chat interativo com Alê sobre projeto específico
-    
-    Args:
-        user_message: Pergunta do usuário
-        project_context: Contexto do projeto
-        chat_history: Histórico da conversa
-    
-    Returns:
-        Resposta de Alê
-    """
-    agent = create_ale_agent()
-    
+def _ale_chat_messages(user_message: str, project_context: dict, chat_history: list) -> list:
+    """Contexto do projeto + histórico + nova pergunta"""
     # Adiciona contexto do projeto no início
     context_message = f"""
     [CONTEXTO DO PROJETO]
@@ -219,7 +527,145 @@ async def run_ale_chat(user_message: str, project_context: dict, chat_history: l
     # Adiciona nova mensagem do usuário
     messages.append(UserMessage(parts=[TextPart(text=user_message)]))
     
-    output = await agent.run_async(messages)
+    return messages
+
+
+async def run_ale_chat(user_message: str, project_context: dict, chat_history: list) -> str:
+    """
+    Chat interativo com Alê sobre projeto específico
+    
+    Args:
+        user_message: Pergunta do usuário
+        project_context: Contexto do projeto
+        chat_history: Histórico da conversa
+    
+    Returns:
+        Resposta de Alê
+    """
+    agent = create_ale_agent(structured=False)
+    
+    output = await agent.run_async(_ale_chat_messages(user_message, project_context, chat_history))
     
     # Retorna texto da resposta (não estruturado para chat)
-    return output.content[0].text if output.content else "Desculpe, não consegui gerar resposta."
+    return output.text or "Desculpe, não consegui gerar resposta."
+
+
+@functools.cache
+def _ale_tools() -> dict[str, Tool]:
+    """Tools do Alê por nome, para o laço de tools do chat em streaming"""
+    tools = [Tool.from_callable(fn) for fn in (buscar_portal_mapa, consultar_dados_abertos_mapa)]
+    return {tool.name: tool for tool in tools}
+
+
+async def _run_ale_tool(call: ToolExecutionSuggestion) -> ToolExecutionResult:
+    """Executa uma tool pedida pelo modelo; erro vira resultado para o modelo contornar"""
+    try:
+        result = await _ale_tools()[call.tool_name].call_async(**call.args)
+    except Exception as e:
+        return ToolExecutionResult(suggestion=call, result=None, success=False, error_message=str(e))
+    return ToolExecutionResult(suggestion=call, result=result)
+
+
+def _tool_call_args(arguments: str) -> dict:
+    """Argumentos da tool call; JSON inválido vira {} e o erro volta ao modelo pela tool"""
+    try:
+        args = orjson.loads(arguments or "{}")
+    except orjson.JSONDecodeError:
+        return {}
+    return args if isinstance(args, dict) else {}
+
+
+async def _stream_ale_round(
+    provider: OpenRouterGenerationProvider,
+    messages: list,
+    tool_choice: Literal["auto", "none"],
+) -> AsyncIterator[str | ToolExecutionSuggestion]:
+    """
+    Uma rodada do chat lida direto do SSE do OpenRouter
+    
+    O adaptador de streaming do agentle agrupa os deltas de tool call pelo id, que o
+    formato OpenAI só manda no primeiro delta de cada chamada, e não expõe tool_choice;
+    aqui os deltas são agrupados pelo index. As mensagens e tools passam pelos
+    adaptadores do próprio provider.
+    
+    Yields:
+        Trechos de texto à medida que chegam e, ao final, as tool calls pedidas
+    """
+    openrouter_messages = []
+    for message in messages:
+        adapted = provider.message_adapter.adapt(message)
+        openrouter_messages.extend(adapted if isinstance(adapted, list) else [adapted])
+    
+    body = {
+        "model": ALE_MODEL,
+        "messages": openrouter_messages,
+        # As tools seguem declaradas mesmo com "none": o histórico já pode ter tool calls
+        "tools": [provider.tool_adapter.adapt(tool) for tool in _ale_tools().values()],
+        "tool_choice": tool_choice,
+        "stream": True,
+    }
+    headers = {"Authorization": f"Bearer {provider.api_key}"}
+    
+    calls: dict[int, dict[str, str]] = {}
+    async with get_http_client().stream(
+        "POST", f"{provider.base_url}/chat/completions", json=body, headers=headers
+    ) as response:
+        if response.is_error:
+            await response.aread()
+            response.raise_for_status()
+        async for line in response.aiter_lines():
+            # Linhas ": OPENROUTER PROCESSING" são keep-alive
+            if not line.startswith("data: ") or line == "data: [DONE]":
+                continue
+            chunk = orjson.loads(line[len("data: "):])
+            if "error" in chunk:
+                raise RuntimeError(f"OpenRouter interrompeu o streaming: {chunk['error']}")
+            for choice in chunk.get("choices", ()):
+                delta = choice.get("delta") or {}
+                if delta.get("content"):
+                    yield delta["content"]
+                for tool_call in delta.get("tool_calls") or ():
+                    call = calls.setdefault(tool_call.get("index", 0), {"id": "", "name": "", "arguments": ""})
+                    function = tool_call.get("function") or {}
+                    call["id"] = tool_call.get("id") or call["id"]
+                    call["name"] = function.get("name") or call["name"]
+                    call["arguments"] += function.get("arguments") or ""
+    
+    for _, call in sorted(calls.items()):
+        yield ToolExecutionSuggestion(id=call["id"], tool_name=call["name"], args=_tool_call_args(call["arguments"]))
+
+
+async def stream_ale_chat(user_message: str, project_context: dict, chat_history: list) -> AsyncIterator[str]:
+    """
+    Mesmo chat de run_ale_chat, mas entrega o texto em pedaços à medida que é gerado
+    
+    O Agent do agentle não repassa pedaços quando há tools (só a resposta pronta),
+    então o laço de tools roda aqui: cada rodada é transmitida e, se o modelo pedir
+    tools, elas rodam e a rodada seguinte continua o streaming.
+    
+    Yields:
+        Trechos novos da resposta de Alê
+    """
+    agent = create_ale_agent(structured=False)
+    messages = [
+        DeveloperMessage(parts=[TextPart(text=agent.instructions)]),
+        *_ale_chat_messages(user_message, project_context, chat_history),
+    ]
+    
+    for rodada in range(ALE_CHAT_MAX_TOOL_ROUNDS + 1):
+        tool_choice = "auto" if rodada < ALE_CHAT_MAX_TOOL_ROUNDS else "none"
+        text = ""
+        calls: list[ToolExecutionSuggestion] = []
+        async for item in _stream_ale_round(agent.generation_provider, messages, tool_choice):
+            if isinstance(item, str):
+                text += item
+                yield item
+            else:
+                calls.append(item)
+        
+        if not calls:
+            return
+        
+        messages.append(AssistantMessage(parts=[*([TextPart(text=text)] if text else []), *calls]))
+        results = await asyncio.gather(*(_run_ale_tool(call) for call in calls))
+        messages.append(UserMessage(parts=list(results)))
@@ -0,0 +1,60 @@
+"""
+Clientes compartilhados pelos agentes
+Um único pool HTTP (HTTP/2, keep-alive) para OpenRouter e páginas estáticas
+"""
+from urllib.parse import unquote, urlparse
+import os
+
+import httpx
+
+
+# Status dos projetos (API) e cache das tools dos agentes
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=256)
+# Padrão do cliente = gerações do OpenRouter, que só respondem ao final (análise com PDF,
+# extração do MAPA); 300 s é o mesmo default do provider do agentle.
+# Fetches de páginas passam o próprio timeout, curto.
+HTTP_TIMEOUT = httpx.Timeout(300, connect=5)
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Cliente HTTP do processo
+
+    Na API é aberto no lifespan; em scripts (example.py) é criado na primeira chamada.
+    Sem ele, o OpenRouterGenerationProvider abre um cliente (e um handshake TLS) por geração.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def redis_cache_options(url: str = REDIS_URL) -> dict:
+    """
+    Parâmetros do RedisCache do aiocache a partir de uma URL redis://
+
+    Usuário e senha chegam percent-encoded na URL, como o redis.from_url espera.
+    O RedisCache não tem parâmetro de usuário (ACL): vai pelo pool de conexões.
+    """
+    parsed = urlparse(url)
+    options = {
+        "endpoint": parsed.hostname or "localhost",
+        "port": parsed.port or 6379,
+        "db": int(parsed.path.lstrip("/") or 0),
+        "password": unquote(parsed.password) if parsed.password else None,
+        "ssl": parsed.scheme == "rediss",
+    }
+    if parsed.username:
+        options["connection_pool_kwargs"] = {"username": unquote(parsed.username)}
+    return options
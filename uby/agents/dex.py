@@ -13,6 +13,10 @@ from agentle.web.extraction_preferences import ExtractionPreferences
 from playwright.async_api import async_playwright
 from pydantic import BaseModel, Field
 from typing import List, Optional
+import functools
+import httpx
+
+from uby.agents.clients import get_http_client
 
 
 # Schema de resposta estruturada de Alê
@@ -288,8 +292,13 @@ async def consultar_dados_internos_ubyagro(categoria: str, cultura: str) -> dict
 
 
 def create_dex_agent() -> Agent:
-    """Cria e configura o agente Dex"""
-    
+    """Cria e configura o agente Dex (reaproveitado entre análises)"""
+    return _build_dex_agent(get_http_client())
+
+
+@functools.lru_cache(maxsize=1)
+def _build_dex_agent(http_client: httpx.AsyncClient) -> Agent:
+    # Cache por cliente HTTP, como no Alê: cliente novo no lifespan -> agente novo
     system_instructions = """
     Você é Dex, agente de inteligência de dados da UbyAgro.
     
@@ -322,9 +331,10 @@ def create_dex_agent() -> Agent:
     Tom: Analítico, baseado em evidências, conecta teoria com prática, cientista de dados moderno.
     """
     
-    provider = OpenRouterGenerationProvider.with_fallback_models([
-        "anthropic/claude-3.5-sonnet"
-    ])
+    provider = OpenRouterGenerationProvider.with_fallback_models(
+        ["anthropic/claude-3.5-sonnet"],
+        http_client=http_client,
+    )
     
     agent = Agent(
         instructions=system_instructions,
@@ -336,3 +346,47 @@ def create_dex_agent() -> Agent:
     )
     
     return agent
+
+
+async def run_dex_analysis(project_context: dict) -> DexResponse:
+    """
+    Executa análise científica e de dados internos
+    
+    Args:
+        project_context: {
+            "name": "Bioestimulante Algas Soja",
+            "category": "bioestimulantes",
+            "target_crop": "soja",
+            "pdf_content": "...",  # texto extraído do PDF
+        }
+    
+    Returns:
+        Análise estruturada de Dex
+    """
+    agent = create_dex_agent()
+    
+    user_prompt = f"""
+    Analise a viabilidade científica do seguinte projeto:
+    
+    Nome: {project_context['name']}
+    Categoria: {project_context['category']}
+    Cultura-alvo: {project_context['target_crop']}
+    
+    Conteúdo técnico:
+    {project_context.get('pdf_content', 'Bioestimulante à base de algas marinhas')}
+    
+    Forneça:
+    1. Status de viabilidade científica (verde/amarelo/vermelho)
+    2. Número de artigos relevantes e nível de evidência
+    3. Eficácia reportada na literatura
+    4. Performance de produtos similares nos dados internos
+    5. Insight-chave cruzando teoria e prática
+    """
+    
+    message_history = [
+        UserMessage(parts=[TextPart(text=user_prompt)])
+    ]
+    
+    output = await agent.run_async(message_history)
+    
+    return output.parsed
@@ -1,28 +1,118 @@
 # main.py
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional, List, Literal
+from typing import Any, Optional, List, Literal
 from datetime import datetime
-import uuid
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import logging
+import multiprocessing
 import os
+import shutil
+import orjson
+import redis.asyncio as redis
+from ulid import ULID
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from agentle.generations.models.message_parts.text import TextPart
+from agentle.generations.models.messages.assistant_message import AssistantMessage
+from agentle.generations.models.messages.user_message import UserMessage
+from uby.agents.ale import browser_manager, run_ale_analysis, stream_ale_chat
+from uby.agents.clients import REDIS_URL, close_http_client, get_http_client
+from uby.agents.dex import run_dex_analysis
+from uby.pdf import extract_pdf_text
+
+# MVP: PDFs salvos localmente (produção: S3/MinIO)
+UPLOAD_DIR = "uploads"
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# MVP: chaves do projeto expiram sozinhas (produção: banco de dados)
+PROJECT_TTL_SECONDS = 30 * 24 * 60 * 60
+# Mensagens do chat guardadas por projeto e agente (pergunta + resposta = 2)
+CHAT_HISTORY_MAX_MESSAGES = 20
+# Intervalo em que o WebSocket de status reconfere o Redis sem receber eventos
+STATUS_WS_POLL_SECONDS = 15
+
+# Análises simultâneas e projetos aguardando na fila (cheia -> 429)
+ANALYSIS_WORKERS = 8
+ANALYSIS_QUEUE_SIZE = 64
+
+# Processos para extrair texto dos PDFs; mais que as análises simultâneas não ajuda
+PDF_WORKERS = min(ANALYSIS_WORKERS, os.cpu_count() or 1)
+
+# Um único processo do uvicorn: fila de análises, workers, Chromium e pool de PDF vivem
+# no processo, então N workers multiplicariam tudo isso (e os limites acima) por N.
+# MVP: escala vertical via ANALYSIS_WORKERS (produção: fila no Redis e workers separados)
+SERVER_WORKERS = 1
+
+# Conexões simultâneas (acima -> 503) e fila de accept do socket;
+# folgados em relação à fila de análises, que já recusa excesso com 429
+SERVER_LIMIT_CONCURRENCY = 1024
+SERVER_BACKLOG = 2048
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    app.state.redis = redis.from_url(REDIS_URL, decode_responses=True)
+    # OpenAPI é gerado sob demanda; aquece aqui para o /docs não pagar na 1ª visita
+    app.openapi()
+    # Um único pool HTTP/2 para OpenRouter e fetch estático de todos os agentes
+    app.state.http = get_http_client()
+    # Um único Chromium para todas as tools dos agentes
+    await browser_manager.start()
+    # Parsing de PDF é CPU: fica fora do event loop (e do GIL)
+    # forkserver: fork com as threads já abertas (redis, Chromium, executor) pode travar o filho
+    app.state.pdf_pool = ProcessPoolExecutor(
+        max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+    )
+    app.state.analysis_queue = asyncio.Queue(maxsize=ANALYSIS_QUEUE_SIZE)
+    workers = [
+        asyncio.create_task(_analysis_worker(app.state.analysis_queue))
+        for _ in range(ANALYSIS_WORKERS)
+    ]
+    yield
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    # Projetos que ainda estavam na fila não serão analisados por este processo
+    while not app.state.analysis_queue.empty():
+        project_id, _ = app.state.analysis_queue.get_nowait()
+        await _fail_unfinished(project_id)
+    # shutdown() espera os processos: fora do event loop
+    await asyncio.to_thread(app.state.pdf_pool.shutdown, cancel_futures=True)
+    await browser_manager.stop()
+    await close_http_client()
+    await app.state.redis.aclose()
+
+
 app = FastAPI(
     title="BioGrow API",
     description="Plataforma de Inteligência Competitiva para o Agro",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# CORS para desenvolvimento
+# Compressão de JSON acima de 1 KB; o Starlette já deixa text/event-stream (SSE) de fora
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# CORS para desenvolvimento (só o que o frontend usa)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:5173"],  # React/Vite
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
 )
 
 # ============================================================================
@@ -37,10 +127,13 @@ class LoginResponse(BaseModel):
     token: str
     user: dict
 
+ProjectCategory = Literal["biodefensivos", "bioestimulantes", "adjuvantes", "nutricao_foliar", "biofertilizantes"]
+TargetCrop = Literal["soja", "milho", "cana", "cafe", "algodao"]
+
 class ProjectCreate(BaseModel):
     name: str
-    category: Literal["biodefensivos", "bioestimulantes", "adjuvantes", "nutricao_foliar", "biofertilizantes"]
-    target_crop: Literal["soja", "milho", "cana", "cafe", "algodao"]
+    category: ProjectCategory
+    target_crop: TargetCrop
     description: Optional[str] = None
 
 class AgentProgress(BaseModel):
@@ -85,6 +178,11 @@ class ChatResponse(BaseModel):
     response: dict
     timestamp: datetime
 
+# Resolve os schemas no import: referência pendente quebra o deploy, não a 1ª request
+for _model in (LoginResponse, ProjectStatus, ProjectAnalysis, AgentAnalysisDetails, AgentProgress, ChatResponse):
+    _model.model_rebuild()
+del _model
+
 # ============================================================================
 # MOCK DATA (Para o Frontend trabalhar enquanto você implementa)
 # ============================================================================
@@ -163,6 +261,19 @@ MOCK_ANALYSIS_DATA = {
     "alerts": []
 }
 
+# Mock validado e serializado uma única vez; por requisição só o project_id é trocado
+_MOCK_PROJECT_ID = orjson.dumps("__PROJECT_ID__")
+_MOCK_ANALYSIS_TEMPLATE = orjson.dumps(
+    ProjectAnalysis.model_validate({**MOCK_ANALYSIS_DATA, "project_id": "__PROJECT_ID__"}).model_dump()
+)
+
+_HEALTH_RESPONSE = orjson.dumps({"status": "healthy", "version": "1.0.0"})
+_ROOT_RESPONSE = orjson.dumps({
+    "message": "BioGrow API",
+    "version": "1.0.0",
+    "docs": "/docs"
+})
+
 # ============================================================================
 # AUTH (Simplificado para MVP)
 # ============================================================================
@@ -174,10 +285,221 @@ def verify_token(token: str = Depends(lambda: "mock_token")):
         raise HTTPException(status_code=401, detail="Token não fornecido")
     return {"user_id": "user-1", "role": "colaborador"}
 
+# ============================================================================
+# ANÁLISE (Orquestração dos agentes)
+# ============================================================================
+
+# Tempo máximo por agente; um provider travado não segura a análise inteira
+AGENT_TIMEOUT_SECONDS = 120
+# Estimativa exibida enquanto o agente não termina
+AGENT_ESTIMATED_SECONDS = 60
+
+# TODO: Adicionar Merc (mercado) e Pat (patentes) quando os agentes existirem
+AGENT_RUNNERS = {
+    "ale": run_ale_analysis,
+    "dex": run_dex_analysis,
+}
+
+AGENT_NAMES = {
+    "ale": "Alê",
+    "merc": "Merc",
+    "pat": "Pat",
+    "dex": "Dex"
+}
+
+# Agentes com chat em streaming (SSE)
+CHAT_STREAMERS = {
+    "ale": stream_ale_chat,
+}
+
+
+def _status_key(project_id: str) -> str:
+    return f"proj:{project_id}:status"
+
+
+def _status_channel(project_id: str) -> str:
+    return f"proj:{project_id}"
+
+
+def _project_key(project_id: str) -> str:
+    return f"proj:{project_id}:meta"
+
+
+def _results_key(project_id: str) -> str:
+    return f"proj:{project_id}:results"
+
+
+def _chat_key(project_id: str, agent_id: str) -> str:
+    return f"proj:{project_id}:chat:{agent_id}"
+
+
+def _chat_history_messages(raw: list[str]) -> list:
+    """Histórico salvo no Redis -> mensagens do agentle"""
+    messages = []
+    for item in map(orjson.loads, raw):
+        message_cls = UserMessage if item["role"] == "user" else AssistantMessage
+        messages.append(message_cls(parts=[TextPart(text=item["text"])]))
+    return messages
+
+
+async def _append_chat_history(project_id: str, agent_id: str, question: str, answer: str) -> None:
+    key = _chat_key(project_id, agent_id)
+    async with app.state.redis.pipeline(transaction=False) as pipe:
+        pipe.rpush(
+            key,
+            orjson.dumps({"role": "user", "text": question}),
+            orjson.dumps({"role": "assistant", "text": answer}),
+        )
+        pipe.ltrim(key, -CHAT_HISTORY_MAX_MESSAGES, -1)
+        pipe.expire(key, PROJECT_TTL_SECONDS)
+        await pipe.execute()
+
+
+def _agent_progress(status: str) -> AgentProgress:
+    done = status in ("completed", "failed")
+    return AgentProgress(
+        status=status,
+        progress_percent=100 if done else 0,
+        estimated_time_remaining_seconds=0 if done else AGENT_ESTIMATED_SECONDS,
+    )
+
+
+def _project_status(project_id: str, progress: dict[str, AgentProgress]) -> ProjectStatus:
+    """Consolida o progresso dos agentes no status do projeto"""
+    statuses = {p.status for p in progress.values()}
+    if statuses & {"pending", "processing"}:
+        status = "processing"
+    elif "failed" in statuses:
+        status = "failed"
+    else:
+        status = "completed"
+    return ProjectStatus(
+        project_id=project_id,
+        status=status,
+        progress=progress,
+        overall_progress_percent=sum(p.progress_percent for p in progress.values()) // max(len(progress), 1),
+    )
+
+
+async def set_agent_status(project_id: str, agent_id: str, status: str) -> None:
+    """Grava o status do agente no Redis e avisa os inscritos no canal do projeto"""
+    progress = _agent_progress(status)
+    async with app.state.redis.pipeline(transaction=False) as pipe:
+        pipe.hset(_status_key(project_id), agent_id, progress.model_dump_json())
+        pipe.expire(_status_key(project_id), PROJECT_TTL_SECONDS)
+        pipe.publish(
+            _status_channel(project_id),
+            orjson.dumps({"agent_id": agent_id, **progress.model_dump()}),
+        )
+        await pipe.execute()
+
+
+async def get_project_progress(project_id: str) -> dict[str, AgentProgress]:
+    raw = await app.state.redis.hgetall(_status_key(project_id))
+    return {
+        agent_id: AgentProgress.model_validate_json(value)
+        for agent_id, value in raw.items()
+    }
+
+
+async def save_agent_result(project_id: str, agent_id: str, result: BaseModel) -> None:
+    """Grava a resposta estruturada do agente no hash de resultados do projeto"""
+    async with app.state.redis.pipeline(transaction=False) as pipe:
+        pipe.hset(_results_key(project_id), agent_id, result.model_dump_json())
+        pipe.expire(_results_key(project_id), PROJECT_TTL_SECONDS)
+        await pipe.execute()
+
+
+async def _run_agent(project_id: str, agent_id: str, project_ctx: dict) -> Any:
+    await set_agent_status(project_id, agent_id, "processing")
+    try:
+        result = await asyncio.wait_for(
+            AGENT_RUNNERS[agent_id](project_ctx), timeout=AGENT_TIMEOUT_SECONDS
+        )
+        if result is None:
+            # parsed=None: a resposta não bateu com o schema do agente
+            raise ValueError(f"Agente {agent_id} não devolveu resposta estruturada")
+        # Grava antes do "completed": quem vê o status concluído já encontra o resultado
+        await save_agent_result(project_id, agent_id, result)
+    except Exception:
+        await set_agent_status(project_id, agent_id, "failed")
+        raise
+    await set_agent_status(project_id, agent_id, "completed")
+    return result
+
+
+async def _run_all_agents(project_id: str, project_ctx: dict) -> dict[str, Any]:
+    """
+    Executa todos os agentes em paralelo
+
+    Retorna {agent_id: resultado}; falhas e timeouts vêm como a exceção
+    correspondente em vez de derrubar os demais agentes.
+    """
+    results = await asyncio.gather(
+        *(
+            _run_agent(project_id, agent_id, project_ctx)
+            for agent_id in AGENT_RUNNERS
+        ),
+        return_exceptions=True,
+    )
+    return dict(zip(AGENT_RUNNERS, results))
+
+
+async def analyze_project(project_id: str, project_ctx: dict) -> None:
+    """
+    Extrai o texto do PDF e roda os agentes
+
+    As respostas ficam em proj:{id}:results (uma por agente) ao lado do status.
+    TODO: Montar o ProjectAnalysis a partir delas (scores e dados financeiros ainda
+    não saem de nenhum agente; hoje o /analysis devolve o mock)
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        project_ctx["pdf_content"] = await loop.run_in_executor(
+            app.state.pdf_pool, extract_pdf_text, project_ctx["pdf_path"]
+        )
+    except Exception:
+        # Sem texto do PDF os agentes ainda analisam pelos metadados do projeto
+        logger.exception("Falha ao extrair texto do PDF do projeto %s", project_id)
+    
+    results = await _run_all_agents(project_id, project_ctx)
+    for agent_id, result in results.items():
+        if isinstance(result, BaseException):
+            logger.error("Agente %s falhou no projeto %s", agent_id, project_id, exc_info=result)
+
+
+async def _fail_unfinished(project_id: str) -> None:
+    """Marca como failed os agentes que não chegaram ao fim (shutdown)"""
+    progress = await get_project_progress(project_id)
+    for agent_id, agent_progress in progress.items():
+        if agent_progress.status in ("pending", "processing"):
+            await set_agent_status(project_id, agent_id, "failed")
+
+
+async def _analysis_worker(queue: asyncio.Queue) -> None:
+    """Consome a fila de análises; ANALYSIS_WORKERS destes rodam em paralelo"""
+    while True:
+        project_id, project_ctx = await queue.get()
+        try:
+            await analyze_project(project_id, project_ctx)
+        except asyncio.CancelledError:
+            # Shutdown no meio da análise: não deixa agentes em "processing" para sempre
+            await _fail_unfinished(project_id)
+            raise
+        except Exception:
+            logger.exception("Falha na análise do projeto %s", project_id)
+        finally:
+            queue.task_done()
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
 
+def _save_upload(file: UploadFile, file_path: str) -> None:
+    """Copia o upload para o disco em blocos (roda fora do event loop)"""
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(file.file, f, UPLOAD_CHUNK_SIZE)
+
 @app.post("/api/v1/auth/login")
 async def login(request: LoginRequest):
     """Login simplificado (mock)"""
@@ -194,31 +516,52 @@ async def login(request: LoginRequest):
 @app.post("/api/v1/projects")
 async def create_project(
     name: str = Form(...),
-    category: str = Form(...),
-    target_crop: str = Form(...),
+    category: ProjectCategory = Form(...),
+    target_crop: TargetCrop = Form(...),
     description: Optional[str] = Form(None),
     file: UploadFile = File(...),
     current_user: dict = Depends(verify_token)
 ):
     """
-    Cria novo projeto e inicia análise pelos 4 agentes
+    Cria novo projeto e enfileira a análise pelos 4 agentes
     
     TODO: 
     - Salvar PDF em storage
-    - Enfileirar job de análise assíncrona
-    - Processar com os 4 agentes em paralelo
     """
     
-    project_id = f"proj-{uuid.uuid4().hex[:8]}"
+    queue: asyncio.Queue = app.state.analysis_queue
+    if queue.full():
+        raise HTTPException(status_code=429, detail="Fila de análise cheia, tente novamente em instantes")
+    
+    project_id = f"proj-{ULID()}"
     
     # MVP: Salvar PDF localmente (produção: S3/MinIO)
-    os.makedirs("uploads", exist_ok=True)
-    file_path = f"uploads/{project_id}.pdf"
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    file_path = os.path.join(UPLOAD_DIR, f"{project_id}.pdf")
+    await run_in_threadpool(_save_upload, file, file_path)
     
-    # TODO: Enfileirar processamento assíncrono
-    # await queue.enqueue_analysis(project_id, file_path)
+    project_ctx = {
+        "name": name,
+        "category": category,
+        "target_crop": target_crop,
+        "description": description,
+        "pdf_path": file_path,
+    }
+    async with app.state.redis.pipeline(transaction=False) as pipe:
+        pipe.hset(
+            _project_key(project_id),
+            mapping={key: value for key, value in project_ctx.items() if value is not None},
+        )
+        pipe.expire(_project_key(project_id), PROJECT_TTL_SECONDS)
+        await pipe.execute()
+    for agent_id in AGENT_RUNNERS:
+        await set_agent_status(project_id, agent_id, "pending")
+    try:
+        queue.put_nowait((project_id, project_ctx))
+    except asyncio.QueueFull:
+        # A fila encheu durante o upload: desfaz o projeto em vez de bloquear o POST
+        await app.state.redis.delete(_project_key(project_id), _status_key(project_id))
+        await run_in_threadpool(os.remove, file_path)
+        raise HTTPException(status_code=429, detail="Fila de análise cheia, tente novamente em instantes")
     
     return {
         "project_id": project_id,
@@ -234,43 +577,74 @@ async def create_project(
 async def get_project_status(
     project_id: str,
     current_user: dict = Depends(verify_token)
-):
+) -> ProjectStatus:
     """
-    Retorna status do processamento em tempo real
+    Retorna o status atual do processamento (consulta pontual)
     
-    TODO: Consultar Redis/DB para status real de cada agente
+    Para acompanhar em tempo real use o WebSocket /status/ws
     """
-    
-    # MVP: Mock de progresso simulado
-    return {
-        "project_id": project_id,
-        "status": "processing",
-        "progress": {
-            "ale": {
-                "status": "completed",
-                "progress_percent": 100,
-                "estimated_time_remaining_seconds": 0
-            },
-            "merc": {
-                "status": "processing",
-                "progress_percent": 75,
-                "estimated_time_remaining_seconds": 15
-            },
-            "pat": {
-                "status": "processing",
-                "progress_percent": 50,
-                "estimated_time_remaining_seconds": 30
-            },
-            "dex": {
-                "status": "pending",
-                "progress_percent": 0,
-                "estimated_time_remaining_seconds": 60
-            }
-        },
-        "overall_progress_percent": 56
-    }
+    progress = await get_project_progress(project_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    return _project_status(project_id, progress)
 
-@app.get("/api/v1/projects/{project_id}/analysis")
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    """Lê o socket até o cliente desconectar (mensagens do cliente são ignoradas)"""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+@app.websocket("/api/v1/projects/{project_id}/status/ws")
+async def project_status_ws(
+    websocket: WebSocket,
+    project_id: str,
+    current_user: dict = Depends(verify_token)
+):
+    """
+    Envia o status atual e depois cada atualização de agente à medida que acontece
+
+    Fecha a conexão quando todos os agentes terminam, quando o projeto some do
+    Redis ou quando o cliente desconecta.
+    """
+    await websocket.accept()
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    pubsub = app.state.redis.pubsub()
+    # Inscreve antes de ler o snapshot para não perder atualizações no meio
+    await pubsub.subscribe(_status_channel(project_id))
+    try:
+        progress = await get_project_progress(project_id)
+        if not progress:
+            await websocket.close(code=4404, reason="Projeto não encontrado")
+            return
+        status = _project_status(project_id, progress)
+        await websocket.send_text(status.model_dump_json())
+        while status.status == "processing" and not disconnected.done():
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=STATUS_WS_POLL_SECONDS
+            )
+            if message is None:
+                # Sem eventos: confere se o projeto ainda existe (TTL) e se algo mudou
+                progress = await get_project_progress(project_id)
+                if not progress:
+                    break
+                refreshed = _project_status(project_id, progress)
+                if refreshed != status:
+                    status = refreshed
+                    await websocket.send_text(status.model_dump_json())
+                continue
+            await websocket.send_text(message["data"])
+            update = orjson.loads(message["data"])
+            progress[update.pop("agent_id")] = AgentProgress(**update)
+            status = _project_status(project_id, progress)
+        if not disconnected.done():
+            await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+
+@app.get("/api/v1/projects/{project_id}/analysis", response_model=ProjectAnalysis)
 async def get_project_analysis(
     project_id: str,
     current_user: dict = Depends(verify_token)
@@ -282,9 +656,10 @@ async def get_project_analysis(
     """
     
     # MVP: Retornar mock data
-    mock_data = MOCK_ANALYSIS_DATA.copy()
-    mock_data["project_id"] = project_id
-    return mock_data
+    return Response(
+        content=_MOCK_ANALYSIS_TEMPLATE.replace(_MOCK_PROJECT_ID, orjson.dumps(project_id)),
+        media_type="application/json",
+    )
 
 @app.post("/api/v1/projects/{project_id}/chat/{agent_id}")
 async def chat_with_agent(
@@ -299,26 +674,19 @@ async def chat_with_agent(
     TODO: Implementar usando agentle (seu framework)
     """
     
-    chat_id = f"chat-{uuid.uuid4().hex[:8]}"
-    message_id = f"msg-{uuid.uuid4().hex[:6]}"
+    chat_id = f"chat-{ULID()}"
+    message_id = f"msg-{ULID()}"
     
     # AQUI É ONDE VOCÊ VAI INTEGRAR COM AGENTLE
     # agent_response = await run_agent(agent_id, message.message, project_context)
     
     # MVP: Mock response
-    agent_names = {
-        "ale": "Alê",
-        "merc": "Merc",
-        "pat": "Pat",
-        "dex": "Dex"
-    }
-    
-    mock_response = f"[Mock] Resposta do agente {agent_names[agent_id]} para: {message.message}"
+    mock_response = f"[Mock] Resposta do agente {AGENT_NAMES[agent_id]} para: {message.message}"
     
     return {
         "chat_id": chat_id,
         "agent_id": agent_id,
-        "agent_name": agent_names[agent_id],
+        "agent_name": AGENT_NAMES[agent_id],
         "message_id": message_id,
         "response": {
             "text": mock_response,
@@ -327,6 +695,51 @@ async def chat_with_agent(
         "timestamp": datetime.now()
     }
 
+@app.post("/api/v1/projects/{project_id}/chat/{agent_id}/stream")
+async def stream_chat_with_agent(
+    project_id: str,
+    agent_id: Literal["ale", "merc", "pat", "dex"],
+    message: ChatMessage,
+    current_user: dict = Depends(verify_token)
+):
+    """
+    Chat com o agente via Server-Sent Events
+    
+    Cada evento traz {"delta": "..."} com o trecho novo da resposta; o último
+    evento é [DONE]. A conversa continua de onde parou: as últimas
+    CHAT_HISTORY_MAX_MESSAGES mensagens do projeto com o agente vão no contexto.
+    O endpoint JSON acima continua para chamadas programáticas.
+    """
+    if agent_id not in CHAT_STREAMERS:
+        raise HTTPException(status_code=501, detail=f"Chat com {AGENT_NAMES[agent_id]} ainda não disponível")
+    
+    project_ctx = await app.state.redis.hgetall(_project_key(project_id))
+    if not project_ctx:
+        raise HTTPException(status_code=404, detail="Projeto não encontrado")
+    
+    history = _chat_history_messages(
+        await app.state.redis.lrange(_chat_key(project_id, agent_id), 0, -1)
+    )
+    
+    async def events():
+        answer = []
+        try:
+            async for delta in CHAT_STREAMERS[agent_id](message.message, project_ctx, history):
+                answer.append(delta)
+                yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+            # Só respostas completas entram no histórico
+            await _append_chat_history(project_id, agent_id, message.message, "".join(answer))
+        except Exception:
+            logger.exception("Falha no chat com %s (projeto %s)", agent_id, project_id)
+            yield b"data: " + orjson.dumps({"error": "Não foi possível gerar a resposta"}) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
 @app.get("/api/v1/projects")
 async def list_projects(
     status: Literal["all", "processing", "completed", "failed"] = "all",
@@ -395,18 +808,32 @@ async def list_documents(
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "version": "1.0.0"}
+    return Response(content=_HEALTH_RESPONSE, media_type="application/json")
 
 @app.get("/")
 async def root():
-    return {
-        "message": "BioGrow API",
-        "version": "1.0.0",
-        "docs": "/docs"
-    }
+    return Response(content=_ROOT_RESPONSE, media_type="application/json")
 
 
 # ============================================================================
 # PARA RODAR:
-# uvicorn main:app --reload --port 8000
-# ============================================================================
\ No newline at end of file
+# uvicorn uby.api:app --loop uvloop --http httptools --workers 1 --port 8000 \
+#     --limit-concurrency 1024 --backlog 2048
+# (um worker só: ver SERVER_WORKERS)
+# Desenvolvimento: uvicorn uby.api:app --reload --port 8000
+# ============================================================================
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # "auto" escolhe uvloop/httptools quando instalados (uvloop não existe no Windows)
+    uvicorn.run(
+        "uby.api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="auto",
+        workers=SERVER_WORKERS,
+        limit_concurrency=SERVER_LIMIT_CONCURRENCY,
+        backlog=SERVER_BACKLOG,
+    )
@@ -1,3 +1,5 @@
+import asyncio
+
 from agentle.agents.agent import Agent
 from agentle.agents.conversations.local_conversation_store import LocalConversationStore
 from agentle.generations.models.message_parts.text import TextPart
@@ -9,9 +11,11 @@ from agentle.generations.providers.openrouter.openrouter_generation_provider imp
 from agentle.web.extraction_preferences import ExtractionPreferences
 from agentle.web.extractor import Extractor
 from dotenv import load_dotenv
-from playwright import async_api
 from pydantic import BaseModel, Field
 
+from uby.agents.ale import browser_manager
+from uby.agents.clients import close_http_client, get_http_client
+
 load_dotenv()
 
 
@@ -35,7 +39,9 @@ class DesiredWebsiteExtractedContent(BaseModel):
     course_urls: list[str]
 
 
-provider = OpenRouterGenerationProvider.with_fallback_models(["openai/gpt-5-nano"])
+provider = OpenRouterGenerationProvider.with_fallback_models(
+    ["openai/gpt-5-nano"], http_client=get_http_client()
+)
 MODEL = "openai/gpt-oss-120b"
 
 
@@ -63,14 +69,14 @@ async def example_agent_usage() -> None:
 async def example_extractor_usage() -> None:
     extractor = Extractor(llm=provider, model=MODEL)
 
-    async with async_api.async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+    # Chromium compartilhado; imagens, CSS, fontes e mídia já vêm bloqueados
+    async with browser_manager.get_context() as browser:
         urls = ["https://uniube.br"]
 
         preferences = ExtractionPreferences(
             only_main_content=True,
-            wait_for_ms=2000,
-            block_ads=True,
+            wait_for_ms=0,
+            block_ads=False,
             remove_base_64_images=True,
             timeout_ms=15000,
         )
@@ -87,5 +93,8 @@ async def example_extractor_usage() -> None:
 
         print(output_parsed.most_relevant_information)
 
+    await browser_manager.stop()
+    await close_http_client()
+
 if __name__ == "__main__":
     asyncio.run(example_extractor_usage())
@@ -0,0 +1,29 @@
+"""
+Extração de texto dos PDFs enviados nos projetos
+Roda no pool de processos da API (PDFium não é thread-safe e o parsing é CPU)
+"""
+import pypdfium2 as pdfium
+
+
+# Orçamento de texto que vai para os prompts do Alê e do Dex (~50k tokens);
+# um dossiê de centenas de páginas estouraria o contexto do modelo
+PDF_MAX_CHARS = 200_000
+
+
+def extract_pdf_text(pdf_path: str, max_chars: int = PDF_MAX_CHARS) -> str:
+    """Texto das páginas, separadas por linha em branco, cortado em max_chars"""
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        pages = []
+        total = 0
+        for page in pdf:
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+            total += len(pages[-1])
+            if total >= max_chars:
+                break
+        return "\n\n".join(pages).strip()[:max_chars]
+    finally:
+        pdf.close()